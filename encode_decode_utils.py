@@ -14,49 +14,78 @@ Environment: Python 2.7
 
 import os
 import sys
-import chardet
-from xpinyin import Pinyin
+import threading
+
+# chardet and xpinyin each load large data tables at import,
+# which is user-visible startup latency inside Maya.
+# They are imported lazily at first use instead of here
 
 import logging
 logger = logging.getLogger(__name__)
 
 
-def detect_encoding(text):
+# Shared detector for detect_encoding's slow path, built lazily at first use.
+# Reusing one instance avoids rebuilding all the probers per chardet.detect call.
+# The lock is needed since the detector holds mutable state across reset/feed/close
+_DETECTOR = None
+_DETECTOR_LOCK = threading.Lock()
+
+
+def detect_encoding(text, slow=False):
 	"""
 	Detect text encoding method.
     This function may make mistakes if the given text length is too short.
-	
+
 	:type text: unicode or str
+	:type slow: bool    # True to fall back to chardet's full detection
 	:rtype: string    # "unicode" / "utf-8" / "gbk" / "GB2312"
 	"""
 	if isinstance(text, unicode):
 		return "unicode"
-	detected = chardet.detect(text)
-	
-	# If chardet has a result, return the guessed result
-	if detected.get("encoding"):
-		return detected["encoding"].lower()
-	# If chardet does not have a result, try decoding from provided decode methods
-	else:
-		for enc in ["utf-8", "gbk", "big5"]:
-			try:
-				text.decode(enc)
-			except UnicodeDecodeError:
-				continue
-			else:
-				return enc
+
+	# Try decoding with the encodings this library documents.
+	# str.decode runs in C and is far faster than chardet's
+	# python-level classifier for short strings like paths
+	for enc in ["utf-8", "gbk"]:
+		try:
+			text.decode(enc)
+		except UnicodeDecodeError:
+			continue
+		else:
+			return enc
+
+	# Fall back to chardet only when requested,
+	# for less common encodings (e.g. big5)
+	if slow:
+		global _DETECTOR
+		with _DETECTOR_LOCK:
+			if _DETECTOR is None:
+				# CPython caches the module, so later imports are a dict lookup
+				from chardet.universaldetector import UniversalDetector
+				_DETECTOR = UniversalDetector()
+			_DETECTOR.reset()
+			_DETECTOR.feed(text)
+			_DETECTOR.close()
+			detected = _DETECTOR.result
+		if detected.get("encoding"):
+			return detected["encoding"].lower()
 	return ""
 	
 	
-def coding_transition(text, target_encoding):
+def coding_transition(text, target_encoding, from_encoding=None):
 	"""
 	Get unicode / utf-8 str / gbk str version of the given text.
-	
+
 	:type s: unicode or str
 	:type target_encoding: string    "unicode" / "utf-8" / "gbk" / "GB2312"
+	:type from_encoding: string    # optional, skips detect_encoding when the caller already knows it
 	:rtype: unicode or str
 	"""
-	from_encoding = detect_encoding(text)
+	# unicode input needs no detection, whatever the caller claims
+	if isinstance(text, unicode):
+		from_encoding = "unicode"
+	elif from_encoding is None:
+		from_encoding = detect_encoding(text)
 	if not from_encoding:
 		return ""
 	
@@ -70,6 +99,21 @@ def coding_transition(text, target_encoding):
 	return text_unicode.encode(target_encoding)
 
 
+_PINYIN = None
+
+def _get_pinyin():
+    """
+    Lazily build and cache a single Pinyin instance.
+    Pinyin() loads its whole character dictionary from disk,
+    so creating it per call dominates when converting lists of names.
+    """
+    global _PINYIN
+    if _PINYIN is None:
+        from xpinyin import Pinyin
+        _PINYIN = Pinyin()
+    return _PINYIN
+
+
 def chinese_to_pinyin(name_CN):
     """
     Convert Chinese input pinyin characters, with first letter capitalized
@@ -79,8 +123,8 @@ def chinese_to_pinyin(name_CN):
     """
     if not name_CN:
         return ""
-    
-    pinyin_chars = Pinyin().get_pinyin(name_CN).split('-')      # ["bai", "yan", "wu"]
+
+    pinyin_chars = _get_pinyin().get_pinyin(name_CN).split('-')      # ["bai", "yan", "wu"]
     pinyin_chars = [char.capitalize() if char.islower() else char for char in pinyin_chars]     # ["Bai", "Yan", "Wu"]
     result_str = ''.join(pinyin_chars)      # BaiYanWu
     return result_str
\ No newline at end of file
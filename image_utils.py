@@ -10,9 +10,10 @@ Environment: Python 2.7
 """
 
 import os
+import re
 import sys
-import math
-from natsort import natsorted, ns
+import multiprocessing
+import scandir
 from PIL import Image
 from . import path_utils, other_utils
 
@@ -20,6 +21,21 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+# Supported image extensions.
+# frozenset membership is one hash lookup per file,
+# instead of endswith probing each suffix in a tuple
+_IMG_EXTS = frozenset({".png", ".jpg", ".jpeg", ".tif", ".tiff", ".tga", ".bmp", ".dds"})
+
+# Natural-sort key matching the default windows sorting method:
+# split the name on digit runs, compare numeric parts as int
+# and the rest case-insensitively.
+# Much faster than natsort's ns.PATH for the suffix.NNNN.ext names this module produces
+_NUM_RE = re.compile(r"(\d+)")
+
+def _natkey(name):
+    return [int(token) if token.isdigit() else token.lower() for token in _NUM_RE.split(name)]
+
+
 def rename_images_to_format(folder_path, suffix, delete_non_img=False):
     """
     Rename images in folder_path to the format of suffix.xxxx.ext        # e.g. thumbnail.0000.jpg
@@ -32,25 +48,32 @@ def rename_images_to_format(folder_path, suffix, delete_non_img=False):
         return
     
     # Sort the files in folder_path as the default windows sorting method
-    file_list = natsorted(os.listdir(folder_path), alg=ns.PATH | ns.IGNORECASE)
+    file_list = sorted([entry.name for entry in scandir.scandir(folder_path)], key=_natkey)
     if not file_list:
         return
-    
+
+    # The renames must stay serial: old and new name ranges overlap
+    # (e.g. re-running on an already-formatted folder after deleting a frame),
+    # so each rename may only run after the previous one has freed its target name
     index = 0
-    exception_list  =[]
+    exception_list = []
+    # Join the folder prefix once instead of calling os.path.join per iteration
+    folder_path_sep = folder_path + os.sep
     for file in file_list:
-        if file.lower().endswith((".png", ".jpg", ".jpeg", ".tif", ".tiff", ".tga", ".bmp", ".dds")):
-            ori_file_basename, file_extension = os.path.splitext(file)
-            new_file_name = suffix + "." + str("%04d" % index) + file_extension
+        ori_file_basename, file_extension = os.path.splitext(file)
+        if file_extension.lower() in _IMG_EXTS:
+            new_file_name = ''.join((suffix, '.', str(index).zfill(4), file_extension))
             index += 1
+            if file == new_file_name:
+                continue
             try:
-                os.rename(os.path.join(folder_path, file), os.path.join(folder_path, new_file_name))
+                os.rename(folder_path_sep + file, folder_path_sep + new_file_name)
             except Exception as err:
                 exception_list.append("%s: %s"%(file, str(err)))
                 continue
         elif delete_non_img:
             try:
-                os.remove(os.path.join(folder_path, file))
+                os.remove(folder_path_sep + file)
             except:
                 continue
 
@@ -58,6 +81,27 @@ def rename_images_to_format(folder_path, suffix, delete_non_img=False):
         raise Exception("Error while Renaming files: \n"+'\n'.join(exception_list))
     
 
+def reduce_single_img_size(img_path):
+    """
+    Reduce the image size of img_path.
+    Kept at module level so it is picklable for multi_process_run.
+
+    :type img_path: string / unicode
+    """
+    try:
+        img = Image.open(img_path)
+    except:
+        logger.warning("PIL cannot open image: %s"%img_path)
+        return
+
+    try:
+        img.save(img_path, optimize=True)
+    except Exception as err:
+        logger.error("Error while saving image %s: %s"%(img_path, str(err)))
+
+    return
+
+
 def try_reduce_image_size(input_path, size_threshold):
     """
     Try reducing images size in input_path (if input_path is folder),
@@ -68,48 +112,32 @@ def try_reduce_image_size(input_path, size_threshold):
     :type size_threshold: int / float
     :rtype: bool        # True for edited, False for not edited
     """
-
-    def reduce_single_img_size(img_path):
-        """
-        Reduce the image size of img_path
-
-        :type img_path: string / unicode
-        """
-        try:
-            img = Image.open(img_path)
-        except:
-            logger.warning("PIL cannot open image: %s"%img_path)
-            return
-        
-        try:
-            img.save(img_path, optimize=True)
-        except Exception as err:
-            logger.error("Error while saving image %s: %s"%(img_path, str(err)))
-
-        return
-    
     # if input_path is a directory
     if os.path.isdir(input_path):
         img_path_list = []
 
         # Check if any image needs to be reduced in input_path,
-        # and prepare argument tuple for these images
-        for f in os.listdir(input_path):
-            if f.lower().endswith((".png", ".jpg", ".jpeg", ".tif", ".tiff", ".tga", ".bmp", ".dds")):
-                img_path = os.path.join(input_path, f)
-                img_size = int(math.floor(os.path.getsize(img_path) / 1024 ** 2))
+        # and prepare argument tuple for these images.
+        # scandir returns the file size together with the name on Windows,
+        # so no extra stat syscall is needed per file
+        for entry in scandir.scandir(input_path):
+            if os.path.splitext(entry.name)[1].lower() in _IMG_EXTS:
+                # Keep the size in float MB: flooring to whole MB would wrongly skip
+                # images like 1.9MB when size_threshold is 1.5
+                img_size = entry.stat().st_size / (1024.0 ** 2)
                 if img_size >= size_threshold:
-                    img_path_list.append((img_path,))
+                    img_path_list.append((os.path.join(input_path, entry.name),))
 
         if img_path_list:
-            other_utils.multi_thread_run(reduce_single_img_size, img_path_list)
+            # Image encoding is CPU-bound, so run it in processes instead of threads
+            other_utils.multi_process_run(reduce_single_img_size, multiprocessing.cpu_count(), img_path_list)
             return True
         
     # if input_path is file
     else:
-        if not input_path.lower().endswith((".png", ".jpg", ".jpeg", ".tif", ".tiff", ".tga", ".bmp", ".dds")):
+        if os.path.splitext(input_path)[1].lower() not in _IMG_EXTS:
             return False
-        img_size = int(math.floor(os.path.getsize(input_path) / 1024 ** 2))
+        img_size = os.stat(input_path).st_size / (1024.0 ** 2)
         if img_size >= size_threshold:
             reduce_single_img_size(input_path)
             return True
@@ -126,18 +154,20 @@ def image_count(folder_path):
     """
     if not folder_path or not os.path.exists(folder_path):
         return 0, ""
-    
-    # Sort the files in folder_path as the default windows sorting method
-    file_list = natsorted(os.listdir(folder_path), alg=ns.PATH | ns.IGNORECASE)
-    if not file_list:
-        return 0, ""
-    
-    first_img_path = ""
+
+    # One linear scan tracks the count and the naturally-first image,
+    # instead of natural-sorting the whole listing just to take its head
     img_count = 0
-    for f in file_list:
-        if f.lower().endswith((".png", ".jpg", ".jpeg", ".tif", ".tiff", ".tga", ".bmp", ".dds")):
+    first_img_name = ""
+    first_img_key = None
+    for entry in scandir.scandir(folder_path):
+        if os.path.splitext(entry.name)[1].lower() in _IMG_EXTS:
             img_count += 1
-            if not first_img_path:
-                first_img_path = path_utils.norm_path(os.path.join(folder_path, f))
+            key = _natkey(entry.name)
+            if first_img_key is None or key < first_img_key:
+                first_img_key = key
+                first_img_name = entry.name
 
-    return img_count, first_img_path
+    if not first_img_name:
+        return 0, ""
+    return img_count, path_utils.norm_path(os.path.join(folder_path, first_img_name))
@@ -14,8 +14,8 @@ import sys
 import traceback
 import inspect
 import pprint
-import threading
-from Queue import Queue
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor      # pip package "futures" on Python 2.7
 
 import logging
 logger = logging.getLogger(__name__)
@@ -31,32 +31,67 @@ def multi_thread_run(func, thread_limit, args_list):
     """
     if not args_list:
         return
-    
+
+    # ThreadPoolExecutor's internal queue replaces the hand-rolled worker loop,
+    # whose while-not-empty check could let workers exit before the queue was filled
+    with ThreadPoolExecutor(max_workers=thread_limit) as executor:
+        future_list = [executor.submit(func, *args) for args in args_list]
+
+    # Collect failures after all jobs have finished.
+    # exception_info() is specific to the futures backport: Python 2 exceptions
+    # carry no __traceback__, so this is the only way to keep the worker traceback
     exception_list = []
+    for future in future_list:
+        exc, tb = future.exception_info()
+        if exc is not None:
+            exception_list.append(''.join(traceback.format_exception(type(exc), exc, tb)))
+
+    if exception_list:
+        raise Exception('\n'.join(exception_list))
+    
+
+class _ProcessJob(object):
+    """
+    Picklable wrapper used by multi_process_run workers.
+    It unpacks the argument tuple for func,
+    and returns the formatted traceback string if func raises,
+    so the parent process can collect the errors.
+    """
+    def __init__(self, func):
+        self.func = func
 
-    def worker_func(q):
-        while not q.empty():
-            args = q.get()
-            try:
-                func(*args)
-            except Exception as err:
-                error_msg = traceback.format_exc()
-                exception_list.append(error_msg)
-            q.task_done()
+    def __call__(self, args):
+        try:
+            self.func(*args)
+        except Exception:
+            return traceback.format_exc()
+        return None
 
-    jobs = Queue()
 
-    for job_args in args_list:
-        jobs.put(job_args)
+def multi_process_run(func, process_limit, args_list):
+    """
+    Run the given function in multiple processes, with a process limit.
+    Use this instead of multi_thread_run for CPU-bound jobs (e.g. image encoding),
+    since the GIL serializes CPU-heavy work across threads.
 
-    for t in range(thread_limit):
-        worker = threading.Thread(target=worker_func, args=(jobs,))
-        worker.start()
+    :type func: function        # must be defined at module level, so it is picklable
+    :type process_limit: int     # positive integer
+    :type args_list: list[(val1, val2,),(val3, val4,),...]      # (val1, val2,) is used for job1; (val3,val4,) is used for job2; etc.
+    """
+    if not args_list:
+        return
+
+    pool = multiprocessing.Pool(processes=process_limit)
+    try:
+        result_list = pool.map(_ProcessJob(func), args_list)
+    finally:
+        pool.close()
+        pool.join()
 
-    jobs.join()
+    exception_list = [result for result in result_list if result]
     if exception_list:
         raise Exception('\n'.join(exception_list))
-    
+
 
 def print_trace():
     """